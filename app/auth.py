@@ -1,45 +1,28 @@
 # app/auth.py
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from app.config import settings
-from app import schemas, crud, models
+from functools import lru_cache
+from app import crud
 from sqlalchemy.orm import Session
-from app.database import get_db
+# Helper JWT ada di app.tokens (ringan); diekspor ulang di sini untuk kompatibilitas
+from app.tokens import create_access_token, verify_access_token
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib/bcrypt dimuat saat pertama kali dipakai agar import modul ini
+# tetap murah untuk cold start serverless.
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+def __getattr__(name):
+    # Kompatibilitas untuk kode lama yang memakai `auth.pwd_context`
+    if name == "pwd_context":
+        return get_pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
-
-def verify_access_token(token: str, credentials_exception):
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(sub=user_id)
-    except JWTError:
-        raise credentials_exception
-    return token_data.sub
+    return get_pwd_context().hash(password)
 
 def authenticate_user(db: Session, email: str, password: str):
     user = crud.get_user_by_email(db, email=email)
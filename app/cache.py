@@ -0,0 +1,214 @@
+# app/cache.py
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Semua key cache memakai prefix ini supaya aman berbagi database Redis dengan layanan lain
+KEY_PREFIX = "nirmas:cache:"
+
+# Namespace untuk data global (katalog makanan); data per user memakai user_namespace()
+FOODS_NAMESPACE = "foods"
+
+def user_namespace(user_id: int) -> str:
+    return f"user:{user_id}"
+
+class MemoryCache:
+    """
+    Backend LRU in-memory (per proses) dengan TTL, untuk lokal dan testing.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Generasi namespace disimpan terpisah agar tidak ikut ter-evict oleh LRU
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+class RedisCache:
+    """
+    Backend Redis untuk produksi. Error Redis diperlakukan sebagai cache miss
+    supaya endpoint tetap jalan walaupun Redis sedang bermasalah.
+    """
+
+    def __init__(self, url: str):
+        # redis-py dimuat hanya jika backend ini dipakai
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._errors = (redis.RedisError,)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._client.get(key)
+        except self._errors:
+            return None
+
+    def set(self, key: str, value: bytes, ttl: int):
+        try:
+            self._client.set(key, value, ex=ttl)
+        except self._errors:
+            pass
+
+    def generation(self, namespace: str) -> Optional[int]:
+        # None (bukan 0) saat error: generasi tidak diketahui, jadi cache harus dilewati
+        try:
+            return int(self._client.get(f"{KEY_PREFIX}gen:{namespace}") or 0)
+        except self._errors:
+            return None
+
+    def bump(self, namespace: str):
+        try:
+            self._client.incr(f"{KEY_PREFIX}gen:{namespace}")
+        except self._errors:
+            pass
+
+    def clear(self):
+        # Hanya key milik cache ini; jangan flushdb() karena database bisa dipakai bersama
+        try:
+            keys = []
+            for key in self._client.scan_iter(match=f"{KEY_PREFIX}*", count=500):
+                keys.append(key)
+                if len(keys) >= 500:
+                    self._client.delete(*keys)
+                    keys = []
+            if keys:
+                self._client.delete(*keys)
+        except self._errors:
+            pass
+
+class NullCache:
+    """
+    Backend tanpa penyimpanan: setiap lookup miss. ETag tetap dihitung dari body
+    terbaru sehingga 304 tetap benar, hanya tanpa menghemat komputasi.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: int):
+        pass
+
+    def generation(self, namespace: str) -> int:
+        return 0
+
+    def bump(self, namespace: str):
+        pass
+
+    def clear(self):
+        pass
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def _create_cache():
+    if settings.redis_url:
+        return RedisCache(settings.redis_url)
+    if os.environ.get("VERCEL"):
+        logger.warning("REDIS_URL is not set on a multi-instance deployment; response cache disabled")
+        return NullCache()
+    logger.warning("REDIS_URL is not set; using per-process in-memory response cache (local/test only)")
+    return MemoryCache(max_entries=settings.cache_max_entries)
+
+def get_cache():
+    """
+    Backend cache aktif: Redis jika REDIS_URL di-set, selain itu LRU in-memory.
+
+    Cache in-memory hanya berlaku per proses: invalidasi dari satu instance tidak
+    terlihat oleh instance lain. Karena itu di Vercel (banyak instance) tanpa
+    REDIS_URL cache dimatikan dan hanya revalidasi ETag yang aktif.
+    """
+    global _backend
+    backend = _backend
+    if backend is None:
+        # Double-checked locking: backend dibuat tepat satu kali walau request pertama
+        # datang bersamaan, agar tidak ada bump() yang jatuh ke backend yatim
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_cache()
+            backend = _backend
+    return backend
+
+def reset_cache():
+    """Membuang backend aktif; backend baru dibuat dari settings pada get_cache() berikutnya."""
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+def invalidate(*namespaces: str):
+    # Entri lama tidak dihapus satu per satu; naikkan generasi namespace sehingga
+    # key lama tidak pernah dibaca lagi dan habis sendiri lewat TTL/LRU.
+    backend = get_cache()
+    for namespace in namespaces:
+        backend.bump(namespace)
+
+def make_etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+def response_key(namespace: str, path: str) -> Optional[str]:
+    """
+    Key cache untuk `path` pada generasi namespace saat ini. Resolve sekali per
+    request dan pakai key yang sama untuk get_response dan set_response: jika
+    namespace di-invalidate di antaranya, body hasil build disimpan di bawah
+    generasi lama dan tidak akan pernah terbaca.
+
+    Mengembalikan None jika generasi tidak bisa dibaca; pemanggil harus melewati cache.
+    """
+    generation = get_cache().generation(namespace)
+    if generation is None:
+        return None
+    return f"{KEY_PREFIX}resp:{namespace}:{generation}:{path}"
+
+def get_response(key: str) -> Optional[Tuple[str, bytes]]:
+    """Mengembalikan (etag, body) yang tersimpan, atau None jika miss."""
+    value = get_cache().get(key)
+    if value is None:
+        return None
+    etag, _, body = value.partition(b"\n")
+    return etag.decode(), body
+
+def set_response(key: str, body: bytes, ttl: Optional[int] = None) -> str:
+    """Menyimpan body response dan mengembalikan ETag-nya."""
+    etag = make_etag(body)
+    ttl = ttl if ttl is not None else settings.cache_ttl_seconds
+    get_cache().set(key, etag.encode() + b"\n" + body, ttl)
+    return etag
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -5,6 +6,10 @@ class Settings(BaseSettings):
     secret_key: str = "your_secret_key"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    redis_url: Optional[str] = None  # Kosong = pakai cache LRU in-memory
+    cache_ttl_seconds: int = 60
+    cache_max_entries: int = 1024
+    warmup_token: Optional[str] = None  # Kosong = endpoint /_warmup dimatikan
 
     class Config:
         env_file = ".env"
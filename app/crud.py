@@ -1,10 +1,82 @@
 # app/crud.py
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import datetime, date
+from contextlib import contextmanager
+from datetime import datetime, date, time
 from typing import List, Optional
 
-from app import models, schemas, auth
+from app import models, schemas, auth, cache
+
+# --- Unit of work ---
+_UNIT_OF_WORK = "unit_of_work"
+_PENDING_INVALIDATIONS = "pending_cache_invalidations"
+
+@contextmanager
+def unit_of_work(db: Session):
+    """
+    Menggabungkan beberapa operasi CRUD dalam satu transaksi.
+
+    Di dalam blok ini fungsi create/update/delete hanya melakukan flush (id dan
+    default kolom langsung terisi), lalu commit dilakukan sekali di akhir blok.
+    Jika terjadi exception seluruh transaksi di-rollback. Blok bersarang ikut
+    transaksi terluar.
+
+    Contoh:
+        with crud.unit_of_work(db):
+            spectra = crud.create_spectra(db, user_id, spectra_in)
+            crud.create_ml_prediction(db, spectra.id, **prediction)
+    """
+    if db.info.get(_UNIT_OF_WORK):
+        yield db
+        return
+
+    db.info[_UNIT_OF_WORK] = True
+    db.info[_PENDING_INVALIDATIONS] = set()
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    else:
+        # Cache baru di-invalidate setelah commit agar pembaca tidak meng-cache data lama
+        cache.invalidate(*db.info[_PENDING_INVALIDATIONS])
+    finally:
+        db.info.pop(_UNIT_OF_WORK, None)
+        db.info.pop(_PENDING_INVALIDATIONS, None)
+
+def _finish(db: Session, *namespaces: str):
+    if db.info.get(_UNIT_OF_WORK):
+        db.info[_PENDING_INVALIDATIONS].update(namespaces)
+    else:
+        db.commit()
+        cache.invalidate(*namespaces)
+
+def _as_datetime(value):
+    # Kolom tanggal di model bertipe DateTime; skema mengirim `date`
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time())
+    return value
+
+def _as_float(value):
+    return float(value) if value is not None else None
+
+def _save(db: Session, obj, *namespaces: str):
+    """
+    flush mengisi id (RETURNING/lastrowid) dan default kolom Python (created_at,
+    updated_at, ...) tanpa SELECT ulang; session memakai expire_on_commit=False
+    sehingga refresh() tidak dilakukan.
+
+    Jaminannya: objek yang dikembalikan memegang nilai yang ditulis. Fungsi CRUD di
+    bawah menormalkan input skema ke tipe model saat membangun objek ORM (enum model,
+    float untuk kolom Float, datetime untuk kolom DateTime). Transformasi di sisi
+    database (pembulatan, pemotongan string, konversi timezone, trigger) TIDAK
+    tercermin; panggil db.refresh(obj) jika nilai persis dari DB dibutuhkan.
+    """
+    db.add(obj)
+    db.flush()
+    _finish(db, *namespaces)
+    return obj
 
 # --- CRUD for User ---
 def get_user(db: Session, user_id: int):
@@ -20,19 +92,18 @@ def create_user(db: Session, user: schemas.UserCreate):
         email=user.email,
         password_hash=hashed_password,
         gender=user.gender,
-        birthdate=user.birthdate,
+        birthdate=_as_datetime(user.birthdate),
         height_cm=user.height_cm,
         weight_kg=user.weight_kg,
         activity_level=user.activity_level,
         profile_complete=True if user.gender and user.birthdate and user.height_cm and user.weight_kg and user.activity_level else False
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return _save(db, db_user)
 
 def update_user(db: Session, current_user: models.User, user_update: schemas.UserUpdate):
     update_data = user_update.dict(exclude_unset=True)
+    if "birthdate" in update_data:
+        update_data["birthdate"] = _as_datetime(update_data["birthdate"])
     for key, value in update_data.items():
         setattr(current_user, key, value)
     
@@ -44,10 +115,7 @@ def update_user(db: Session, current_user: models.User, user_update: schemas.Use
     else:
         current_user.profile_complete = False
 
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    return _save(db, current_user, cache.user_namespace(current_user.id))
 
 # --- CRUD for NutritionTarget ---
 def get_nutrition_targets(db: Session, user_id: int):
@@ -61,10 +129,7 @@ def update_or_create_nutrition_targets(db: Session, user_id: int, targets_data:
         db_targets.updated_at = datetime.utcnow()
     else:
         db_targets = models.NutritionTarget(**targets_data.dict(), user_id=user_id)
-    db.add(db_targets)
-    db.commit()
-    db.refresh(db_targets)
-    return db_targets
+    return _save(db, db_targets, cache.user_namespace(user_id))
 
 # --- CRUD for Food ---
 def get_foods(db: Session, search: Optional[str] = None, skip: int = 0, limit: int = 100):
@@ -77,11 +142,10 @@ def get_food_by_id(db: Session, food_id: int):
     return db.query(models.Food).filter(models.Food.id == food_id).first()
 
 def create_food(db: Session, food: schemas.FoodCreate):
-    db_food = models.Food(**food.dict())
-    db.add(db_food)
-    db.commit()
-    db.refresh(db_food)
-    return db_food
+    food_data = food.dict()
+    food_data["source"] = models.FoodSource(food.source.value)
+    db_food = models.Food(**food_data)
+    return _save(db, db_food, cache.FOODS_NAMESPACE)
 
 # --- CRUD for Consumption ---
 def get_consumptions(db: Session, user_id: int, from_date: Optional[str] = None, to_date: Optional[str] = None, skip: int = 0, limit: int = 100):
@@ -101,52 +165,41 @@ def create_consumption(db: Session, user_id: int, consumption: schemas.Consumpti
     db_consumption = models.Consumption(
         **consumption.dict(), 
         user_id=user_id, 
-        kcal=kcal, 
-        protein_g=protein_g, 
-        carbs_g=carbs_g, 
-        fat_g=fat_g
+        kcal=_as_float(kcal), 
+        protein_g=_as_float(protein_g), 
+        carbs_g=_as_float(carbs_g), 
+        fat_g=_as_float(fat_g)
     )
-    db.add(db_consumption)
-    db.commit()
-    db.refresh(db_consumption)
-    return db_consumption
+    return _save(db, db_consumption, cache.user_namespace(user_id))
 
 def update_consumption(db: Session, db_consumption: models.Consumption, consumption_update: schemas.ConsumptionUpdate):
     update_data = consumption_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_consumption, key, value)
-    db.add(db_consumption)
-    db.commit()
-    db.refresh(db_consumption)
-    return db_consumption
+    return _save(db, db_consumption, cache.user_namespace(db_consumption.user_id))
 
 def delete_consumption(db: Session, db_consumption: models.Consumption):
+    user_id = db_consumption.user_id
     db.delete(db_consumption)
-    db.commit()
+    _finish(db, cache.user_namespace(user_id))
 
 # --- CRUD for Spectra ---
 def create_spectra(db: Session, user_id: int, spectra: schemas.SpectraCreate):
     db_spectra = models.Spectra(**spectra.dict(), user_id=user_id)
-    db.add(db_spectra)
-    db.commit()
-    db.refresh(db_spectra)
-    return db_spectra
+    return _save(db, db_spectra, cache.user_namespace(user_id))
 
 # --- CRUD for MLPrediction ---
 def create_ml_prediction(db: Session, spectra_id: int, predicted_kcal: float, protein_g: float, carbs_g: float, fat_g: float, model_version: str, quality_score: Optional[float] = None):
     db_prediction = models.MLPrediction(
         spectra_id=spectra_id,
-        predicted_kcal=predicted_kcal,
-        protein_g=protein_g,
-        carbs_g=carbs_g,
-        fat_g=fat_g,
+        predicted_kcal=_as_float(predicted_kcal),
+        protein_g=_as_float(protein_g),
+        carbs_g=_as_float(carbs_g),
+        fat_g=_as_float(fat_g),
         model_version=model_version,
-        quality_score=quality_score
+        quality_score=_as_float(quality_score)
     )
-    db.add(db_prediction)
-    db.commit()
-    db.refresh(db_prediction)
-    return db_prediction
+    return _save(db, db_prediction)
 
 # --- CRUD for Reports ---
 def get_reports(db: Session, user_id: int, range_type: str, start_date: str, end_date: str):
@@ -163,13 +216,10 @@ def get_reports(db: Session, user_id: int, range_type: str, start_date: str, end
 def create_report(db: Session, user_id: int, range_type: str, start_date: date, end_date: date, pdf_path: str):
     db_report = models.Report(
         user_id=user_id,
-        range_type=range_type,
-        start_date=start_date,
-        end_date=end_date,
+        range_type=models.ReportRangeType(getattr(range_type, "value", range_type)),
+        start_date=_as_datetime(start_date),
+        end_date=_as_datetime(end_date),
         pdf_path=pdf_path
     )
-    db.add(db_report)
-    db.commit()
-    db.refresh(db_report)
-    return db_report
+    return _save(db, db_report, cache.user_namespace(user_id))
 
@@ -7,7 +7,9 @@ from app.config import settings
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: objek tetap terisi setelah commit sehingga tidak perlu
+# refresh()/SELECT ulang hanya untuk membaca id dan default yang baru ditulis
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -0,0 +1,220 @@
+# app/export_utils.py
+import csv
+import enum
+import io
+import json
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Jumlah baris per chunk yang diambil dari server-side cursor dan dikirim ke klien
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Kolom per dataset: (nama kolom output, kolom SQLAlchemy, tipe Arrow)
+_CONSUMPTION_COLUMNS = [
+    ("id", models.Consumption.id, "int64"),
+    ("eaten_at", models.Consumption.eaten_at, "timestamp"),
+    ("food_id", models.Consumption.food_id, "int64"),
+    ("food_name", models.Food.name, "string"),
+    ("food_brand", models.Food.brand, "string"),
+    ("food_source", models.Food.source, "string"),
+    ("weight_g", models.Consumption.weight_g, "float64"),
+    ("kcal", models.Consumption.kcal, "float64"),
+    ("protein_g", models.Consumption.protein_g, "float64"),
+    ("carbs_g", models.Consumption.carbs_g, "float64"),
+    ("fat_g", models.Consumption.fat_g, "float64"),
+    ("note", models.Consumption.note, "string"),
+    ("created_at", models.Consumption.created_at, "timestamp"),
+]
+
+_SPECTRA_COLUMNS = [
+    ("id", models.Spectra.id, "int64"),
+    ("measured_at", models.Spectra.measured_at, "timestamp"),
+    ("wavelengths", models.Spectra.wavelengths_json, "list<float64>"),
+    ("absorbance", models.Spectra.absorbance_json, "list<float64>"),
+    ("sample_note", models.Spectra.sample_note, "string"),
+]
+
+_PREDICTION_COLUMNS = [
+    ("id", models.MLPrediction.id, "int64"),
+    ("spectra_id", models.MLPrediction.spectra_id, "int64"),
+    ("predicted_kcal", models.MLPrediction.predicted_kcal, "float64"),
+    ("protein_g", models.MLPrediction.protein_g, "float64"),
+    ("carbs_g", models.MLPrediction.carbs_g, "float64"),
+    ("fat_g", models.MLPrediction.fat_g, "float64"),
+    ("model_version", models.MLPrediction.model_version, "string"),
+    ("quality_score", models.MLPrediction.quality_score, "float64"),
+    ("created_at", models.MLPrediction.created_at, "timestamp"),
+]
+
+EXPORT_DATASETS = {
+    "consumptions": _CONSUMPTION_COLUMNS,
+    "spectra": _SPECTRA_COLUMNS,
+    "predictions": _PREDICTION_COLUMNS,
+}
+
+def build_export_query(dataset: str, user_id: int, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None):
+    """
+    Membangun SELECT (Core, bukan ORM) untuk dataset ekspor milik satu user,
+    diurutkan berdasarkan waktu agar hasil ekspor stabil. `to_date` bersifat
+    inklusif: seluruh hari tersebut ikut diekspor.
+    """
+    columns = EXPORT_DATASETS[dataset]
+    stmt = select(*[column for _, column, _ in columns])
+    if dataset == "consumptions":
+        time_column = models.Consumption.eaten_at
+        stmt = stmt.join(models.Food, models.Consumption.food_id == models.Food.id, isouter=True)
+        stmt = stmt.where(models.Consumption.user_id == user_id)
+        order_by = (time_column, models.Consumption.id)
+    elif dataset == "spectra":
+        time_column = models.Spectra.measured_at
+        stmt = stmt.where(models.Spectra.user_id == user_id)
+        order_by = (time_column, models.Spectra.id)
+    else:
+        time_column = models.MLPrediction.created_at
+        stmt = stmt.join(models.Spectra, models.MLPrediction.spectra_id == models.Spectra.id)
+        stmt = stmt.where(models.Spectra.user_id == user_id)
+        order_by = (time_column, models.MLPrediction.id)
+    if from_date:
+        stmt = stmt.where(time_column >= from_date)
+    if to_date:
+        # Tambahkan 1 hari untuk mencakup seluruh tanggal 'to_date'
+        stmt = stmt.where(time_column < to_date + timedelta(days=1))
+    return stmt.order_by(*order_by)
+
+def _iter_row_chunks(db: Session, stmt, chunk_size: int):
+    # yield_per mengaktifkan server-side cursor (stream_results) sehingga
+    # driver tidak menarik seluruh hasil ke memori sekaligus.
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    try:
+        for partition in result.partitions(chunk_size):
+            yield partition
+    finally:
+        result.close()
+
+def _plain_value(value, type_name: str):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if type_name == "list<float64>" and isinstance(value, str):
+        # Kolom JSON bisa kembali sebagai string mentah tergantung dialek
+        return json.loads(value)
+    return value
+
+def _csv_value(value, type_name: str):
+    value = _plain_value(value, type_name)
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+def _stream_csv(chunks, names, types) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in chunks:
+        writer.writerows([_csv_value(value, type_name) for value, type_name in zip(row, types)] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.getvalue():
+        # Ekspor kosong: header belum sempat terkirim
+        yield buffer.getvalue().encode("utf-8")
+
+class _ChunkSink(io.RawIOBase):
+    """File-like sederhana yang menampung byte dari writer Arrow sampai di-drain."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _arrow_type(pa, name: str):
+    if name == "int64":
+        return pa.int64()
+    if name == "float64":
+        return pa.float64()
+    if name == "timestamp":
+        return pa.timestamp("us")
+    if name == "list<float64>":
+        return pa.list_(pa.float64())
+    return pa.string()
+
+def _stream_arrow(chunks, names, types) -> Iterator[bytes]:
+    # pyarrow hanya dimuat ketika ada ekspor Arrow (lihat kebijakan lazy import)
+    import pyarrow as pa
+
+    schema = pa.schema([pa.field(name, _arrow_type(pa, type_name)) for name, type_name in zip(names, types)])
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    for rows in chunks:
+        arrays = [
+            pa.array([_plain_value(row[i], type_name) for row in rows], type=schema.field(i).type)
+            for i, type_name in enumerate(types)
+        ]
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+def stream_export(
+    db: Session,
+    dataset: str,
+    user_id: int,
+    fmt: str = "csv",
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Generator yang mengalirkan riwayat user sebagai CSV atau Arrow IPC stream.
+
+    Baris dibaca per chunk dari server-side cursor sebagai tuple (tanpa objek ORM),
+    ditulis, lalu dibuang, sehingga memori tetap konstan berapapun panjang riwayatnya.
+
+    Args:
+        db (Session): Session database; pemanggil bertanggung jawab menutupnya.
+        dataset (str): "consumptions", "spectra", atau "predictions".
+        user_id (int): Pemilik data yang diekspor.
+        fmt (str): "csv" atau "arrow".
+        from_date (datetime, optional): Awal rentang (inklusif).
+        to_date (datetime, optional): Tanggal akhir rentang (inklusif, satu hari penuh).
+
+    Raises:
+        ValueError: Jika dataset atau format tidak dikenal.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Unknown export dataset: {dataset}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    columns = EXPORT_DATASETS[dataset]
+    names = [name for name, _, _ in columns]
+    types = [type_name for _, _, type_name in columns]
+    stmt = build_export_query(dataset, user_id, from_date, to_date)
+    chunks = _iter_row_chunks(db, stmt, chunk_size)
+    if fmt == "csv":
+        return _stream_csv(chunks, names, types)
+    return _stream_arrow(chunks, names, types)
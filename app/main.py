@@ -1,12 +1,188 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, abort, jsonify, request, stream_with_context
+from werkzeug.exceptions import BadRequest, Unauthorized
+from datetime import datetime
 import os
 
 app = Flask(__name__)
 
+if os.environ.get("TRAFFIC_CAPTURE_PATH"):
+    # Rekam request (tersanitasi) ke JSONL untuk load test: scripts/replay_traffic.py
+    from app.traffic_capture import install_capture
+    install_capture(
+        app,
+        os.environ["TRAFFIC_CAPTURE_PATH"],
+        sample_rate=float(os.environ.get("TRAFFIC_CAPTURE_SAMPLE_RATE", "1.0")),
+    )
+
 @app.route("/")
 def root():
     return jsonify({"message": "NIRMAS API is running 🚀"})
 
+@app.route("/health")
+def health():
+    # Harus tetap ringan: jangan impor numpy/fpdf/DB di sini
+    return jsonify({"status": "ok"})
+
+@app.route("/_warmup", methods=["POST"])
+def warmup():
+    # Hanya untuk provisioning: wajib header X-Warmup-Token yang cocok dengan WARMUP_TOKEN
+    import hmac
+    from app.config import settings
+    from app.warmup import warm_up
+
+    token = request.headers.get("X-Warmup-Token", "")
+    if not settings.warmup_token or not hmac.compare_digest(token, settings.warmup_token):
+        abort(404)
+    return jsonify({"status": "warm", "timings_ms": warm_up()})
+
+def current_user_id() -> int:
+    # Ambil user dari header "Authorization: Bearer <token>"
+    from app import tokens
+
+    header = request.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise Unauthorized("Could not validate credentials")
+    return int(tokens.verify_access_token(token, Unauthorized("Could not validate credentials")))
+
+def cached_json(namespace: str, build_body, private: bool = False) -> Response:
+    """
+    Menyajikan body JSON dari cache response (atau membangunnya lewat `build_body`)
+    dengan ETag, sehingga polling dengan If-None-Match yang tidak berubah dapat 304.
+    """
+    from app import cache
+
+    key = cache.response_key(namespace, request.full_path)
+    cached = cache.get_response(key) if key is not None else None
+    if cached is not None:
+        etag, body = cached
+    elif key is not None:
+        body = build_body()
+        etag = cache.set_response(key, body)
+    else:
+        # Backend cache bermasalah: sajikan body terbaru tanpa menyimpan
+        body = build_body()
+        etag = cache.make_etag(body)
+
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache" if private else "public, no-cache"
+    return response.make_conditional(request)
+
+def _to_json(schema, obj) -> str:
+    # Schema masih memakai `orm_mode`; di pydantic v2 mode atribut harus diminta eksplisit
+    return schema.model_validate(obj, from_attributes=True).model_dump_json()
+
+def _json_list(schema, objs) -> bytes:
+    return ("[" + ",".join(_to_json(schema, obj) for obj in objs) + "]").encode("utf-8")
+
+@app.route("/foods")
+def list_foods():
+    from app import cache, crud, schemas
+    from app.database import SessionLocal
+
+    def build_body():
+        db = SessionLocal()
+        try:
+            foods = crud.get_foods(
+                db,
+                search=request.args.get("search"),
+                skip=request.args.get("skip", 0, type=int),
+                limit=request.args.get("limit", 100, type=int),
+            )
+            return _json_list(schemas.Food, foods)
+        finally:
+            db.close()
+
+    return cached_json(cache.FOODS_NAMESPACE, build_body)
+
+@app.route("/foods/<int:food_id>")
+def get_food(food_id):
+    from app import cache, crud, schemas
+    from app.database import SessionLocal
+
+    def build_body():
+        db = SessionLocal()
+        try:
+            food = crud.get_food_by_id(db, food_id)
+            if food is None:
+                abort(404)
+            return _to_json(schemas.Food, food).encode("utf-8")
+        finally:
+            db.close()
+
+    return cached_json(cache.FOODS_NAMESPACE, build_body)
+
+@app.route("/nutrition-targets")
+def get_nutrition_targets():
+    # Autentikasi dulu: token tidak valid -> 401 sebelum cache/ORM disentuh
+    user_id = current_user_id()
+
+    from app import cache, crud, schemas
+    from app.database import SessionLocal
+
+    def build_body():
+        db = SessionLocal()
+        try:
+            targets = crud.get_nutrition_targets(db, user_id)
+            if targets is None:
+                abort(404)
+            return _to_json(schemas.NutritionTarget, targets).encode("utf-8")
+        finally:
+            db.close()
+
+    return cached_json(cache.user_namespace(user_id), build_body, private=True)
+
+def date_arg(name: str):
+    # Tanggal query string (YYYY-MM-DD); input tidak valid -> 400, bukan error di tengah stream
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise BadRequest(f"Invalid '{name}' date, expected YYYY-MM-DD")
+
+@app.route("/export/<dataset>")
+def export_history(dataset):
+    from app import export_utils
+    from app.database import SessionLocal
+
+    user_id = current_user_id()
+    fmt = request.args.get("format", "csv")
+    if dataset not in export_utils.EXPORT_DATASETS or fmt not in export_utils.EXPORT_FORMATS:
+        abort(404)
+    from_date = date_arg("from")
+    to_date = date_arg("to")
+
+    db = SessionLocal()
+
+    def generate():
+        # Session hidup selama stream berjalan dan ditutup setelah chunk terakhir
+        try:
+            yield from export_utils.stream_export(
+                db,
+                dataset,
+                user_id,
+                fmt=fmt,
+                from_date=from_date,
+                to_date=to_date,
+            )
+        finally:
+            db.close()
+
+    extension = "csv" if fmt == "csv" else "arrows"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=export_utils.EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={dataset}_{user_id}.{extension}"},
+    )
+
+if os.environ.get("WARMUP_ON_START") == "1":
+    # Untuk instance yang di-provision: muat subsistem berat sebelum request pertama
+    from app.warmup import warm_up
+    warm_up()
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port)
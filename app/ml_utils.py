@@ -1,6 +1,8 @@
 # app/ml_utils.py
 from typing import List, Dict, Any, Optional
-import numpy as np
+
+# NumPy sengaja tidak diimpor di level modul: biayanya besar saat cold start
+# dan hanya endpoint scan/prediksi yang membutuhkannya.
 
 # Fungsi utilitas Beer-Lambert
 def beer_lambert_law(absorbance: float, molar_absorptivity: float, path_length_cm: float) -> float:
@@ -31,6 +33,8 @@ def extract_features_from_spectra(wavelengths: List[float], absorbance: List[flo
     if not wavelengths or not absorbance:
         return features
 
+    import numpy as np
+
     # Contoh fitur dummy: rata-rata absorbansi, puncak max, dll.
     features["mean_absorbance"] = np.mean(absorbance)
     features["max_absorbance"] = np.max(absorbance)
@@ -62,6 +66,8 @@ def simulate_ml_prediction(
     # Ekstraksi fitur (bisa menggunakan model_features yang disediakan jika ada)
     features = model_features if model_features else extract_features_from_spectra(wavelengths, absorbance)
 
+    import numpy as np
+
     # Contoh logika prediksi dummy berdasarkan fitur
     # Ini sangat disederhanakan; model ML sungguhan akan jauh lebih kompleks
     predicted_kcal = 1000 + (features.get("mean_absorbance", 0) * 500) + (features.get("max_absorbance", 0) * 200)
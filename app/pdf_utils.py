@@ -1,7 +1,9 @@
-from fpdf import FPDF
 from datetime import datetime
 
 def generate_pdf(consumptions, totals, username):
+    # fpdf dimuat saat laporan pertama dibuat, bukan saat aplikasi start
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
@@ -0,0 +1,30 @@
+# app/tokens.py
+# Helper JWT yang hanya bergantung pada config (jose dimuat saat dipakai), sehingga
+# route yang cuma butuh autentikasi token tidak ikut mengimpor ORM, pydantic, atau passlib.
+from datetime import datetime, timedelta
+from typing import Optional
+from app.config import settings
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
+
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.utcnow() + expires_delta
+    else:
+        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    return encoded_jwt
+
+def verify_access_token(token: str, credentials_exception):
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        user_id = payload.get("sub")
+        if not isinstance(user_id, str):
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+    return user_id
@@ -0,0 +1,121 @@
+# app/traffic_capture.py
+import hashlib
+import hmac
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from flask import Flask, g, request
+
+# Kredensial tidak pernah direkam. Dicocokkan per nama field (case-insensitive):
+# nama persis atau berakhiran `_<nama>`, misalnya `new_password`, `access_token`
+CREDENTIAL_KEYS = ("password", "token", "secret", "authorization", "api_key")
+REDACTED = "***"
+
+# Data pribadi (PII) diganti placeholder unik per nilai, bukan "***" seragam: nilai
+# yang sama tetap sama dan nilai berbeda tetap berbeda, sehingga index unik
+# (mis. users.email) tidak bentrok saat replay
+PII_KEYS = ("email", "name", "note", "sample_note")
+
+# `name` pada route ini adalah data katalog (nama makanan), bukan PII
+PUBLIC_NAME_PREFIXES = ("/foods",)
+
+# Header conditional request ikut direkam agar replay tetap menguji jalur 304
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+def _is_credential(key: str) -> bool:
+    return any(key == name or key.endswith("_" + name) for name in CREDENTIAL_KEYS)
+
+class Sanitizer:
+    """
+    Menyamarkan field sensitif secara rekursif pada dict/list.
+
+    Placeholder PII dihitung dengan HMAC berkunci acak per proses, jadi stabil
+    selama satu sesi rekam tetapi tidak bisa dibalik dengan menebak nilai aslinya.
+    """
+
+    def __init__(self, key: Optional[bytes] = None):
+        self._key = key if key is not None else os.urandom(32)
+
+    def placeholder(self, field: str, value):
+        digest = hmac.new(self._key, str(value).encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+        if field == "email":
+            return f"user-{digest}@example.invalid"
+        return f"{field}-{digest}"
+
+    def sanitize(self, value, pii_keys=PII_KEYS):
+        if isinstance(value, dict):
+            return {key: self._field(str(key).lower(), item, pii_keys) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.sanitize(item, pii_keys) for item in value]
+        return value
+
+    def _field(self, key: str, value, pii_keys):
+        if _is_credential(key):
+            return REDACTED
+        if key in pii_keys and value is not None:
+            if isinstance(value, list):
+                return [self.placeholder(key, item) for item in value]
+            return self.placeholder(key, value)
+        return self.sanitize(value, pii_keys)
+
+def pii_keys_for(path: str):
+    """Field PII yang berlaku untuk `path`."""
+    if path.startswith(PUBLIC_NAME_PREFIXES):
+        return tuple(key for key in PII_KEYS if key != "name")
+    return PII_KEYS
+
+class TrafficRecorder:
+    """
+    Merekam request yang masuk ke file JSONL (satu request per baris) untuk
+    di-replay oleh scripts/replay_traffic.py. Header Authorization tidak pernah
+    disimpan; yang dicatat hanya apakah request membawa token.
+    """
+
+    def __init__(self, path: str, sample_rate: float = 1.0, sanitizer: Optional[Sanitizer] = None):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.sanitizer = sanitizer or Sanitizer()
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self):
+        g._capture_start = time.perf_counter()
+
+    def _after_request(self, response):
+        start = g.pop("_capture_start", None)
+        if start is None or random.random() >= self.sample_rate:
+            return response
+        pii_keys = pii_keys_for(request.path)
+        record = {
+            "ts": datetime.utcnow().isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "route": request.url_rule.rule if request.url_rule else None,
+            "query": self.sanitizer.sanitize(request.args.to_dict(flat=False), pii_keys),
+            "json": self.sanitizer.sanitize(request.get_json(silent=True), pii_keys),
+            "headers": {name: request.headers[name] for name in CONDITIONAL_HEADERS if name in request.headers},
+            "auth": request.headers.get("Authorization", "").lower().startswith("bearer "),
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        return response
+
+def install_capture(app: Flask, path: Optional[str], sample_rate: float = 1.0) -> Optional[TrafficRecorder]:
+    """Memasang perekam traffic jika `path` di-set; jika tidak, tidak melakukan apa-apa."""
+    if not path:
+        return None
+    recorder = TrafficRecorder(path, sample_rate=sample_rate)
+    recorder.init_app(app)
+    return recorder
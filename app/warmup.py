@@ -0,0 +1,51 @@
+# app/warmup.py
+import importlib
+import time
+from typing import Dict
+
+# Subsistem berat yang sengaja dimuat secara lazy (lihat ml_utils, pdf_utils, auth, tokens),
+# ditambah ORM yang baru diimpor oleh route yang memakai database
+HEAVY_MODULES = ("numpy", "fpdf", "passlib.context", "jose.jwt", "app.models", "app.crud")
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+def warm_up(check_db: bool = True) -> Dict[str, float]:
+    """
+    Memuat semua subsistem berat di depan, untuk instance yang sudah di-provision
+    sehingga request pertama tidak menanggung biaya import.
+
+    Returns:
+        Dict[str, float]: Durasi (ms) tiap langkah; -1 jika langkah tersebut gagal.
+    """
+    timings = {}
+    for name in HEAVY_MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            timings[name] = _elapsed_ms(start)
+        except ImportError:
+            timings[name] = -1
+
+    from app import auth, database
+
+    # Backend bcrypt baru dimuat passlib pada hash pertama
+    start = time.perf_counter()
+    try:
+        auth.get_password_hash("warm-up")
+        timings["bcrypt"] = _elapsed_ms(start)
+    except Exception:
+        timings["bcrypt"] = -1
+
+    if check_db:
+        from sqlalchemy import text
+
+        start = time.perf_counter()
+        try:
+            with database.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            timings["database"] = _elapsed_ms(start)
+        except Exception:
+            timings["database"] = -1
+
+    return timings
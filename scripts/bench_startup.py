@@ -0,0 +1,98 @@
+# scripts/bench_startup.py
+"""
+Benchmark biaya import (cold start) per modul aplikasi.
+
+Setiap modul diimpor di interpreter baru dengan `python -X importtime`, sehingga
+angka yang dilaporkan setara dengan cold start di serverless.
+
+Pemakaian:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 5 --top 10 app.main app.auth
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "app.config",
+    "app.database",
+    "app.models",
+    "app.schemas",
+    "app.tokens",
+    "app.auth",
+    "app.crud",
+    "app.ml_utils",
+    "app.pdf_utils",
+    "app.main",
+]
+
+# Modul yang tidak boleh ikut termuat oleh route ringan (health-check, auth)
+HEAVY_MODULES = ("numpy", "fpdf")
+
+def measure(module: str):
+    """
+    Mengimpor `module` di proses baru dan mem-parsing output `-X importtime`.
+
+    Returns:
+        tuple: (cumulative_us modul tersebut atau None jika gagal,
+                dict {nama_modul: self_us} untuk semua import yang terjadi,
+                pesan error atau None)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    imports = {}
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumul_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # baris header
+        name = parts[2].strip()
+        imports[name] = self_us
+        if name == module:
+            cumulative = cumul_us
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "exit %d" % proc.returncode
+        return None, imports, error
+    return cumulative, imports, None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per modul (diambil median)")
+    parser.add_argument("--top", type=int, default=0, help="Tampilkan N import termahal per modul")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<20} {'median ms':>10} {'min ms':>10}  heavy deps loaded")
+    for module in args.modules:
+        samples = []
+        imports = {}
+        error = None
+        for _ in range(args.repeat):
+            cumulative, imports, error = measure(module)
+            if cumulative is None:
+                break
+            samples.append(cumulative / 1000)
+        if not samples:
+            print(f"{module:<20} {'FAILED':>10} {'':>10}  {error}")
+            continue
+        heavy = [name for name in HEAVY_MODULES if name in imports]
+        print(f"{module:<20} {statistics.median(samples):>10.1f} {min(samples):>10.1f}  {', '.join(heavy) or '-'}")
+        if args.top:
+            for name, self_us in sorted(imports.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+                print(f"    {name:<40} {self_us / 1000:>8.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
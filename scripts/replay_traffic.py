@@ -0,0 +1,254 @@
+# scripts/replay_traffic.py
+"""
+Replay traffic hasil rekaman (app/traffic_capture.py) untuk load test.
+
+Secara default script ini menjalankan instance lokal dengan database SQLite
+sementara yang sudah di-seed, lalu memutar ulang rekaman dengan konkurensi dan
+rate tertentu. Hasilnya: throughput, latency p50/p95/p99 dan error rate per route.
+
+Pemakaian:
+    TRAFFIC_CAPTURE_PATH=traffic.jsonl python -m app.main   # rekam
+    python scripts/replay_traffic.py traffic.jsonl --concurrency 16 --rate 200 --loops 5
+    python scripts/replay_traffic.py traffic.jsonl --target http://localhost:5000 --token <jwt>
+"""
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def seed_database(users: int, foods: int, consumptions_per_user: int):
+    """Mengisi database (DATABASE_URL aktif) dengan data sintetis yang deterministik."""
+    from app import models
+    from app.database import SessionLocal, engine
+
+    models.Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        for food_id in range(1, foods + 1):
+            db.add(models.Food(
+                id=food_id,
+                name=f"Makanan {food_id}",
+                kcal_per_100g=50 + food_id % 400,
+                protein_g_per_100g=food_id % 30,
+                carbs_g_per_100g=food_id % 60,
+                fat_g_per_100g=food_id % 20,
+                source=models.FoodSource.internal,
+            ))
+        start = datetime(2024, 1, 1)
+        for user_id in range(1, users + 1):
+            db.add(models.User(id=user_id, name=f"User {user_id}", email=f"user{user_id}@example.com"))
+            db.add(models.NutritionTarget(user_id=user_id, daily_calorie=2000, protein_g=75, carbs_g=250, fat_g=65))
+            for i in range(consumptions_per_user):
+                db.add(models.Consumption(
+                    user_id=user_id,
+                    food_id=1 + (user_id * 31 + i) % foods,
+                    weight_g=100,
+                    eaten_at=start + timedelta(hours=7 * i),
+                    kcal=200, protein_g=10, carbs_g=25, fat_g=8,
+                ))
+        db.commit()
+    finally:
+        db.close()
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_local_server(env, startup_timeout=30):
+    """
+    Menjalankan `python -m app.main` sebagai proses terpisah pada port bebas dan
+    menunggu /health siap; mengembalikan (url, proses).
+
+    Proses terpisah (bukan thread) supaya server tidak berbagi interpreter dan GIL
+    dengan thread klien replay, yang akan ikut membebani latency yang diukur.
+    """
+    port = _free_port()
+    env = dict(env, PORT=str(port))
+    # Log akses per request dibuang: hanya menambah noise dan overhead pada pengukuran
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.main"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"app.main berhenti saat startup (exit {proc.returncode})")
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return url, proc
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.1)
+    stop_local_server(proc)
+    raise RuntimeError(f"app.main tidak siap dalam {startup_timeout} detik")
+
+def stop_local_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+def send(target, record, token, timeout, scheduled_at=None):
+    """
+    Mengirim satu request; mengembalikan (status atau None, latency ms).
+
+    Jika `scheduled_at` diberikan, latency dihitung dari waktu terjadwal, bukan dari
+    saat request benar-benar dikirim, sehingga waktu antre di sisi klien ikut
+    terukur (menghindari coordinated omission).
+    """
+    url = target + record["path"]
+    if record.get("query"):
+        url += "?" + urlencode(record["query"], doseq=True)
+    data = None
+    # Header conditional (If-None-Match/If-Modified-Since) dikirim ulang apa adanya
+    headers = dict(record.get("headers") or {})
+    if record.get("json") is not None:
+        data = json.dumps(record["json"]).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    if record.get("auth") and token:
+        headers["Authorization"] = f"Bearer {token}"
+    req = urllib.request.Request(url, data=data, headers=headers, method=record.get("method", "GET"))
+    start = scheduled_at if scheduled_at is not None else time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    return status, (time.perf_counter() - start) * 1000
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Metode nearest-rank
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def replay(target, records, concurrency, rate, loops, token, timeout):
+    """
+    Memutar ulang `records` sebanyak `loops` kali. Jika `rate` > 0, request
+    dijadwalkan open-loop pada rate tersebut (req/s); jika 0, secepat mungkin.
+    """
+    schedule = [record for _ in range(loops) for record in records]
+    results = defaultdict(list)
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def run(index_record):
+        index, record = index_record
+        scheduled_at = None
+        if rate > 0:
+            scheduled_at = start + index / rate
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        status, latency_ms = send(target, record, token, timeout, scheduled_at)
+        key = f"{record.get('method', 'GET')} {record.get('route') or record['path']}"
+        with lock:
+            results[key].append((status, latency_ms))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, enumerate(schedule)))
+    return results, time.perf_counter() - start
+
+def is_error(status):
+    return status is None or status >= 400
+
+def report(results, elapsed, rate=0):
+    total = sum(len(samples) for samples in results.values())
+    achieved = total / elapsed if elapsed else 0.0
+    if rate > 0:
+        status = "OK" if achieved >= 0.95 * rate else "NOT REACHED"
+        print(f"rate: requested {rate:.1f} req/s, achieved {achieved:.1f} req/s ({status})")
+        print("latency diukur dari waktu terjadwal (termasuk antrean klien)")
+    else:
+        print(f"rate: unthrottled, achieved {achieved:.1f} req/s")
+    print(f"{'route':<40} {'count':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    all_samples = []
+    for key in sorted(results):
+        samples = results[key]
+        all_samples.extend(samples)
+        _print_row(key, samples, elapsed)
+    _print_row("TOTAL", all_samples, elapsed)
+
+def _print_row(label, samples, elapsed):
+    latencies = sorted(latency for _, latency in samples)
+    errors = sum(1 for status, _ in samples if is_error(status))
+    print(
+        f"{label:<40} {len(samples):>7} {len(samples) / elapsed:>8.1f} "
+        f"{percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f} "
+        f"{100 * errors / max(1, len(samples)):>6.1f}%"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="File JSONL hasil TRAFFIC_CAPTURE_PATH")
+    parser.add_argument("--target", help="URL instance yang sudah berjalan; default: instance lokal + SQLite ter-seed")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0, help="Request per detik (0 = secepat mungkin)")
+    parser.add_argument("--loops", type=int, default=1, help="Berapa kali rekaman diputar ulang")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--token", help="Bearer token untuk request ber-auth (default: token user seed #1)")
+    parser.add_argument("--seed-users", type=int, default=50)
+    parser.add_argument("--seed-foods", type=int, default=500)
+    parser.add_argument("--seed-consumptions", type=int, default=200, help="Jumlah konsumsi per user")
+    args = parser.parse_args(argv)
+
+    records = load_records(args.capture)
+    if not records:
+        print("Rekaman kosong", file=sys.stderr)
+        return 1
+
+    server = None
+    token = args.token
+    target = args.target
+    if not target:
+        # Konfigurasi harus di-set sebelum modul app diimpor; env yang sama dipakai server
+        db_path = os.path.join(tempfile.mkdtemp(prefix="nirmas-replay-"), "replay.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+        os.environ.pop("TRAFFIC_CAPTURE_PATH", None)
+        os.environ.pop("REDIS_URL", None)
+        sys.path.insert(0, ROOT)
+        seed_database(args.seed_users, args.seed_foods, args.seed_consumptions)
+        target, server = start_local_server(os.environ)
+        if not token:
+            from app import tokens
+            token = tokens.create_access_token({"sub": "1"})
+
+    try:
+        results, elapsed = replay(target, records, args.concurrency, args.rate, args.loops, token, args.timeout)
+    finally:
+        if server is not None:
+            stop_local_server(server)
+    report(results, elapsed, args.rate)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from app import cache, models, tokens
+from app.config import settings
+from app.database import SessionLocal, engine as app_engine
+from app.main import app as flask_app
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(settings, "redis_url", None)
+    monkeypatch.delenv("VERCEL", raising=False)
+    cache.reset_cache()
+    yield cache.get_cache()
+    cache.reset_cache()
+
+
+@pytest.fixture
+def db(memory_cache):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    session.commits = []
+    event.listen(session, "after_commit", lambda s: session.commits.append(True))
+    session.add(models.User(id=1, name="Tester", email="tester@example.com"))
+    session.commit()
+    session.commits.clear()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(db):
+    # Route membuka session lewat SessionLocal(); arahkan sementara ke engine test
+    SessionLocal.configure(bind=db.get_bind())
+    yield flask_app.test_client()
+    SessionLocal.configure(bind=app_engine)
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": "Bearer " + tokens.create_access_token({"sub": "1"})}
@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from app import cache, crud, models, schemas
+
+
+@pytest.fixture
+def foods(db):
+    db.add(models.Food(
+        id=1, name="Nasi", kcal_per_100g=130, protein_g_per_100g=2.7,
+        carbs_g_per_100g=28, fat_g_per_100g=0.3, source=models.FoodSource.internal,
+    ))
+    db.commit()
+
+
+def test_matching_if_none_match_returns_304(client, foods):
+    first = client.get("/foods?search=nas")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    second = client.get("/foods?search=nas", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_create_food_changes_etag(client, db, foods):
+    etag = client.get("/foods?search=nas").headers["ETag"]
+
+    crud.create_food(db, schemas.FoodCreate(
+        name="Nasi goreng", kcal_per_100g=170, protein_g_per_100g=6,
+        carbs_g_per_100g=25, fat_g_per_100g=6,
+    ))
+    response = client.get("/foods?search=nas", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert b"Nasi goreng" in response.data
+
+
+def test_nutrition_targets_are_private(client, db, auth_headers):
+    crud.update_or_create_nutrition_targets(
+        db, 1, schemas.NutritionTargetCreate(daily_calorie=2000, protein_g=75, carbs_g=250, fat_g=65),
+    )
+
+    response = client.get("/nutrition-targets", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_unauthorized_request_never_reaches_cache(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("cache consulted before authentication")
+
+    monkeypatch.setattr(cache, "response_key", fail)
+    monkeypatch.setattr(cache, "get_response", fail)
+
+    response = client.get("/nutrition-targets", headers={"Authorization": "Bearer not-a-jwt"})
+
+    assert response.status_code == 401
+
+
+def test_body_built_before_invalidation_is_never_served(memory_cache):
+    key = cache.response_key(cache.FOODS_NAMESPACE, "/foods?")
+    assert cache.get_response(key) is None
+
+    cache.invalidate(cache.FOODS_NAMESPACE)
+    cache.set_response(key, b"OLD")
+
+    assert cache.get_response(cache.response_key(cache.FOODS_NAMESPACE, "/foods?")) is None
+
+
+def test_unknown_generation_bypasses_cache(client, foods, memory_cache, monkeypatch):
+    monkeypatch.setattr(memory_cache, "generation", lambda namespace: None)
+    monkeypatch.setattr(memory_cache, "set", lambda *args: pytest.fail("cache written without a generation"))
+
+    response = client.get("/foods")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+
+
+def test_redis_generation_error_is_unknown_not_zero():
+    pytest.importorskip("redis")
+    backend = cache.RedisCache("redis://127.0.0.1:1/0")
+
+    assert backend.generation(cache.FOODS_NAMESPACE) is None
+
+
+def test_backend_is_created_once_under_concurrency(memory_cache):
+    cache.reset_cache()
+    barrier = threading.Barrier(16)
+    seen = []
+
+    def first_call():
+        barrier.wait()
+        seen.append(cache.get_cache())
+
+    threads = [threading.Thread(target=first_call) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(backend) for backend in seen}) == 1
+
+
+def test_memory_cache_evicts_least_recently_used():
+    backend = cache.MemoryCache(max_entries=2)
+    backend.set("a", b"1", 60)
+    backend.set("b", b"2", 60)
+    backend.get("a")
+    backend.set("c", b"3", 60)
+
+    assert backend.get("a") == b"1"
+    assert backend.get("b") is None
+    assert backend.get("c") == b"3"
@@ -0,0 +1,112 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event, inspect
+
+from app import cache, crud, models, schemas
+
+
+def spectra_in():
+    return schemas.SpectraCreate(
+        wavelengths_json=[900.0, 950.0],
+        absorbance_json=[0.4, 0.6],
+        measured_at=datetime(2024, 1, 1, 8, 0),
+    )
+
+
+def food_in(**overrides):
+    data = dict(name="Nasi", kcal_per_100g=130, protein_g_per_100g=2.7, carbs_g_per_100g=28, fat_g_per_100g=0.3)
+    data.update(overrides)
+    return schemas.FoodCreate(**data)
+
+
+def test_unit_of_work_commits_once(db):
+    with crud.unit_of_work(db):
+        spectra = crud.create_spectra(db, 1, spectra_in())
+        prediction = crud.create_ml_prediction(db, spectra.id, 500, 20, 60, 10, "v1.0-simulated")
+        assert db.commits == []
+
+    assert len(db.commits) == 1
+    assert spectra.id is not None
+    assert prediction.spectra_id == spectra.id
+    assert isinstance(prediction.created_at, datetime)
+
+
+def test_unit_of_work_rolls_back_on_exception(db):
+    with pytest.raises(RuntimeError):
+        with crud.unit_of_work(db):
+            crud.create_spectra(db, 1, spectra_in())
+            raise RuntimeError("boom")
+
+    assert db.commits == []
+    assert db.query(models.Spectra).count() == 0
+    assert not db.info
+
+
+def test_nested_unit_of_work_joins_outer_transaction(db):
+    with crud.unit_of_work(db):
+        crud.create_food(db, food_in())
+        with crud.unit_of_work(db):
+            crud.create_food(db, food_in(name="Tempe"))
+        assert db.commits == []
+
+    assert len(db.commits) == 1
+    assert db.query(models.Food).count() == 2
+
+
+def test_unit_of_work_invalidates_cache_only_after_commit(db, memory_cache):
+    namespace = cache.user_namespace(1)
+    generation = memory_cache.generation(namespace)
+
+    with crud.unit_of_work(db):
+        crud.create_spectra(db, 1, spectra_in())
+        assert memory_cache.generation(namespace) == generation
+
+    assert memory_cache.generation(namespace) == generation + 1
+
+    with pytest.raises(RuntimeError):
+        with crud.unit_of_work(db):
+            crud.create_spectra(db, 1, spectra_in())
+            raise RuntimeError("boom")
+
+    assert memory_cache.generation(namespace) == generation + 1
+
+
+def test_write_returns_values_coerced_to_column_types(db):
+    food = crud.create_food(db, food_in())
+    assert food.source is models.FoodSource.internal
+    assert isinstance(food.kcal_per_100g, float)
+
+    consumption = crud.create_consumption(
+        db, 1, schemas.ConsumptionCreate(food_id=food.id, weight_g=100, eaten_at=datetime(2024, 1, 1, 12)),
+        kcal=130, protein_g=3, carbs_g=28, fat_g=0,
+    )
+    assert isinstance(consumption.kcal, float)
+
+    user = crud.update_user(db, db.get(models.User, 1), schemas.UserUpdate(birthdate=date(1990, 5, 17)))
+    assert user.birthdate == datetime(1990, 5, 17)
+
+
+def test_write_returns_values_validated_by_schema(db):
+    user = crud.update_user(db, db.get(models.User, 1), schemas.UserUpdate(height_cm=170.0, weight_kg=65.0))
+
+    assert user.height_cm == 170 and isinstance(user.height_cm, int)
+    assert user.weight_kg == 65 and isinstance(user.weight_kg, int)
+
+
+def test_nutrition_target_update_returns_updated_at_without_reload(db):
+    targets = schemas.NutritionTargetCreate(daily_calorie=2000, protein_g=75, carbs_g=250, fat_g=65)
+    created = crud.update_or_create_nutrition_targets(db, 1, targets)
+    first_updated_at = created.updated_at
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    updated = crud.update_or_create_nutrition_targets(db, 1, targets.copy(update={"daily_calorie": 1800}))
+    statements.clear()
+
+    assert updated is created
+    assert not inspect(updated).expired_attributes
+    assert isinstance(updated.updated_at, datetime)
+    assert updated.updated_at >= first_updated_at
+    assert updated.daily_calorie == 1800
+    assert statements == []
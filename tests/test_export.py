@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+
+from app import export_utils, models
+
+
+@pytest.fixture
+def history(db):
+    db.add(models.Food(
+        id=1, name="Nasi", kcal_per_100g=130, protein_g_per_100g=2.7,
+        carbs_g_per_100g=28, fat_g_per_100g=0.3, source=models.FoodSource.internal,
+    ))
+    for day in (1, 2, 3):
+        db.add(models.Consumption(
+            user_id=1, food_id=1, weight_g=100 * day, eaten_at=datetime(2024, 1, day, 12),
+            kcal=130 * day, protein_g=2.7, carbs_g=28, fat_g=0.3,
+        ))
+    db.add(models.Spectra(
+        user_id=1, wavelengths_json=[900.0, 950.0], absorbance_json=[0.4, 0.6],
+        measured_at=datetime(2024, 1, 1, 8),
+    ))
+    db.commit()
+
+
+def csv_lines(response):
+    return response.data.decode("utf-8").splitlines()
+
+
+def test_export_requires_token(client):
+    assert client.get("/export/consumptions").status_code == 401
+
+
+def test_csv_export_joins_consumptions_with_foods(client, auth_headers, history):
+    response = client.get("/export/consumptions", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    lines = csv_lines(response)
+    assert lines[0].split(",") == [name for name, _, _ in export_utils.EXPORT_DATASETS["consumptions"]]
+    assert len(lines) == 4
+    assert lines[1].startswith("1,2024-01-01T12:00:00,1,Nasi,,internal,100.0,130.0,")
+
+
+def test_arrow_export_reads_back(client, auth_headers, history):
+    pa = pytest.importorskip("pyarrow")
+
+    response = client.get("/export/spectra?format=arrow", headers=auth_headers)
+
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.num_rows == 1
+    assert table.column("wavelengths").to_pylist() == [[900.0, 950.0]]
+
+
+@pytest.mark.parametrize("query", ["from=bad", "to=bad", "to=2024-13-01"])
+def test_bad_date_range_is_rejected_before_streaming(client, auth_headers, history, query):
+    assert client.get(f"/export/consumptions?{query}", headers=auth_headers).status_code == 400
+
+
+def test_to_date_is_inclusive(client, auth_headers, history):
+    response = client.get("/export/consumptions?from=2024-01-02&to=2024-01-02", headers=auth_headers)
+
+    lines = csv_lines(response)
+    assert len(lines) == 2
+    assert ",2024-01-02T12:00:00," in lines[1]
+
+
+@pytest.mark.parametrize("path", ["/export/users", "/export/consumptions?format=xlsx"])
+def test_unknown_dataset_or_format_is_404(client, auth_headers, path):
+    assert client.get(path, headers=auth_headers).status_code == 404
+
+
+def test_empty_export_still_yields_header(client, auth_headers):
+    response = client.get("/export/predictions", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert csv_lines(response) == [",".join(name for name, _, _ in export_utils.EXPORT_DATASETS["predictions"])]
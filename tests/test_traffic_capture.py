@@ -0,0 +1,41 @@
+import json
+
+from flask import Flask, jsonify, request
+
+from app.traffic_capture import REDACTED, Sanitizer, install_capture
+
+
+def test_credentials_redacted_and_pii_replaced_with_unique_placeholders():
+    sanitizer = Sanitizer(key=b"k")
+
+    first = sanitizer.sanitize({"email": "a@x.com", "password": "p", "access_token": "t", "name": "Ani"})
+    second = sanitizer.sanitize({"email": "b@x.com", "name": "Ani"})
+
+    assert first["password"] == REDACTED and first["access_token"] == REDACTED
+    assert first["email"].endswith("@example.invalid")
+    assert first["email"] != second["email"]
+    assert first["name"] == second["name"] != "Ani"
+    assert "a@x.com" not in json.dumps(first)
+
+
+def test_capture_keeps_food_names_and_conditional_headers(tmp_path):
+    app = Flask(__name__)
+
+    @app.route("/foods", methods=["GET", "POST"])
+    def foods():
+        return jsonify(request.get_json(silent=True))
+
+    path = tmp_path / "traffic.jsonl"
+    install_capture(app, str(path))
+    app.test_client().post(
+        "/foods",
+        json={"name": "Nasi goreng", "note": "rahasia"},
+        headers={"If-None-Match": '"abc"', "Authorization": "Bearer secret"},
+    )
+
+    record = json.loads(path.read_text())
+    assert record["json"]["name"] == "Nasi goreng"
+    assert record["json"]["note"] != "rahasia"
+    assert record["headers"] == {"If-None-Match": '"abc"'}
+    assert record["auth"] is True
+    assert "secret" not in path.read_text()